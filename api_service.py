@@ -1,9 +1,11 @@
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from flask_cors import CORS
 import os
 import sys
 import json
+import threading
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 # --- Import Custom Modules ---
 try:
@@ -18,6 +20,18 @@ CORS(app) # Enable CORS for frontend communication
 
 RULES_FILE = 'rules.json'
 
+# Set SECURESCAN_USE_PCRE2_JIT=1 to compile rules with PCRE2's JIT (needs the pcre2 package)
+USE_PCRE2_JIT = os.environ.get('SECURESCAN_USE_PCRE2_JIT', '').lower() in ('1', 'true', 'yes')
+
+# Content type of streamed scan results (one JSON document per line)
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Clones are network/disk bound, so threads are enough to run them concurrently
+CLONE_WORKERS = 8
+
+# Maximum number of targets in one batch scan (every repository is cloned up front)
+MAX_BATCH_TARGETS = 32
+
 # --- Rules Management Helpers ---
 
 def load_rules():
@@ -38,6 +52,8 @@ def load_rules():
         },
         "SECRET_KEY": {
             "pattern": r"(SECRET|API|TOKEN|KEY)[\s_=\-:]+['\"]([a-zA-Z0-9+/=]{16,})['\"]",
+            "min_entropy": 3.0,
+            "entropy_group": 2,
             "severity": "High",
             "description": "Generic API/Secret Key"
         }
@@ -52,9 +68,36 @@ def save_rules(rules):
     except Exception as e:
         print(f"Error saving rules: {e}")
         return False
+    finally:
+        # Recompile on the next scan even if the file's mtime did not change
+        _rules_cache['mtime'] = None
 
-# Initialize scanner with current rules
-scanner = SecretScanner(load_rules())
+def _rules_mtime():
+    """Returns the modification time of rules.json, or 0 if it is missing."""
+    try:
+        return os.stat(RULES_FILE).st_mtime_ns
+    except OSError:
+        return 0
+
+def get_scanner():
+    """
+    Returns a scanner compiled from the current rules.
+
+    Rules are only re-read and recompiled when rules.json changes. A new
+    scanner is built rather than updating the current one, so scans already
+    running on other threads keep a consistent set of rules. The first
+    scanner is built by the first scan, not at import: the scanner's worker
+    processes import this module again, and would each compile the rules.
+    """
+    mtime = _rules_mtime()
+    with _rules_lock:
+        if mtime != _rules_cache['mtime']:
+            _rules_cache['scanner'] = SecretScanner(load_rules(), use_pcre2_jit=USE_PCRE2_JIT)
+            _rules_cache['mtime'] = mtime
+        return _rules_cache['scanner']
+
+_rules_lock = threading.Lock()
+_rules_cache = {'mtime': None, 'scanner': None}
 
 # --- API Endpoints ---
 
@@ -76,8 +119,7 @@ def scan_endpoint():
     
     local_repo_path = None
     # Refresh rules before scanning to pick up any changes
-    scanner.rules = load_rules()
-    scanner._compile_rules()
+    scanner = get_scanner()
 
     try:
         # 1. Handle Remote GitHub URL
@@ -95,11 +137,17 @@ def scan_endpoint():
         else:
             return jsonify({"error": f"Invalid target. Must be a URL or valid local path: {scan_target}"}), 400
 
-        # 3. Perform Scan
+        # 3. Perform Scan, streaming the findings if the client asked for NDJSON
+        if request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE:
+            stream = _stream_scan(scanner, scan_target, path_to_scan, local_repo_path)
+            # The stream cleans up the cloned repo once it has been scanned
+            local_repo_path = None
+            return Response(stream_with_context(stream), mimetype=NDJSON_MIMETYPE)
+
         findings = scanner.scan_directory(path_to_scan)
         
         # Convert findings to dictionaries
-        findings_json = [f._asdict() for f in findings]
+        findings_json = [f.to_dict() for f in findings]
 
         return jsonify({
             "status": "success",
@@ -121,6 +169,110 @@ def scan_endpoint():
         if local_repo_path:
             cleanup_repo(local_repo_path)
 
+def _stream_scan(scanner, scan_target, path_to_scan, local_repo_path):
+    """
+    Yields the results of a scan as NDJSON, one finding per line as each file is scanned.
+
+    The first line describes the scan ("status": "streaming"), and the last
+    line carries the totals ("status": "success") or the error ("status": "error").
+    """
+    try:
+        yield json.dumps({
+            "status": "streaming",
+            "target": scan_target,
+            "scanned_path": local_repo_path if local_repo_path else scan_target
+        }) + '\n'
+
+        findings_count = 0
+        for finding in scanner.scan_directory_iter(path_to_scan):
+            yield json.dumps(finding.to_dict()) + '\n'
+            findings_count += 1
+
+        yield json.dumps({
+            "status": "success",
+            "findings_count": findings_count,
+            "timestamp": datetime.now().isoformat()
+        }) + '\n'
+    except Exception as e:
+        print(f"[ERROR] Scan failed: {e}")
+        yield json.dumps({"status": "error", "error": f"Scan execution failed: {str(e)}"}) + '\n'
+    finally:
+        if local_repo_path:
+            cleanup_repo(local_repo_path)
+
+def _clone_target(repo_url):
+    """Clones a repository, returning (local_path, error_message)."""
+    try:
+        return clone_repo(repo_url), None
+    except Exception as e:
+        return None, str(e)
+
+@app.route('/api/v1/scan_batch', methods=['POST'])
+def scan_batch_endpoint():
+    """
+    Handles scanning several targets in one request.
+    Accepts 'targets' (list of URLs or local paths); remote repositories are cloned concurrently.
+    """
+    data = request.get_json()
+    targets = data.get('targets') if data else None
+
+    if not targets or not isinstance(targets, list):
+        return jsonify({"error": "Missing 'targets' list in request body."}), 400
+    if not all(isinstance(t, str) and t for t in targets):
+        return jsonify({"error": "Every target must be a non-empty string (URL or path)."}), 400
+    if len(targets) > MAX_BATCH_TARGETS:
+        return jsonify({"error": f"Too many targets: at most {MAX_BATCH_TARGETS} per batch."}), 400
+
+    print(f"[API] Received request to scan {len(targets)} targets")
+
+    # Refresh rules before scanning to pick up any changes
+    scanner = get_scanner()
+
+    # 1. Clone all remote repositories in parallel
+    urls = list(dict.fromkeys(t for t in targets if t.startswith(('http://', 'https://'))))
+    with ThreadPoolExecutor(max_workers=CLONE_WORKERS) as executor:
+        clones = dict(zip(urls, executor.map(_clone_target, urls)))
+
+    try:
+        # 2. Scan each target in the order requested
+        results = []
+        for scan_target in targets:
+            if scan_target in clones:
+                path_to_scan, error = clones[scan_target]
+                if error:
+                    results.append({"target": scan_target, "error": error})
+                    continue
+            elif os.path.isdir(scan_target):
+                path_to_scan = scan_target
+            else:
+                results.append({"target": scan_target, "error": "Invalid target. Must be a URL or valid local path."})
+                continue
+
+            try:
+                findings_json = [f.to_dict() for f in scanner.scan_directory(path_to_scan)]
+            except Exception as e:
+                print(f"[ERROR] Scan of {scan_target} failed: {e}")
+                results.append({"target": scan_target, "error": f"Scan execution failed: {str(e)}"})
+                continue
+
+            results.append({
+                "target": scan_target,
+                "scanned_path": path_to_scan,
+                "findings_count": len(findings_json),
+                "findings": findings_json
+            })
+
+        return jsonify({
+            "status": "success",
+            "results": results,
+            "timestamp": datetime.now().isoformat()
+        })
+    finally:
+        # 3. Cleanup Temp Files
+        for local_repo_path, _ in clones.values():
+            if local_repo_path:
+                cleanup_repo(local_repo_path)
+
 # --- Rule Management Endpoints ---
 
 @app.route('/api/v1/rules', methods=['GET'])
@@ -135,9 +287,21 @@ def add_update_rule(rule_id):
     pattern = data.get('pattern')
     severity = data.get('severity', 'High')
     description = data.get('description', '')
+    # Optional literals, one of which appears in every match (see SecretScanner._compile_triggers)
+    triggers = data.get('triggers')
+    # Optional minimum Shannon entropy (bits per byte) of a match to report it,
+    # scored over the capture group numbered entropy_group (the whole match by default)
+    min_entropy = data.get('min_entropy')
+    entropy_group = data.get('entropy_group')
 
     if not pattern:
         return jsonify({"error": "Missing 'pattern' field"}), 400
+    if triggers is not None and not (isinstance(triggers, list) and all(isinstance(t, str) and t for t in triggers)):
+        return jsonify({"error": "'triggers' must be a list of non-empty strings"}), 400
+    if min_entropy is not None and (isinstance(min_entropy, bool) or not isinstance(min_entropy, (int, float))):
+        return jsonify({"error": "'min_entropy' must be a number"}), 400
+    if entropy_group is not None and (isinstance(entropy_group, bool) or not isinstance(entropy_group, int) or entropy_group < 0):
+        return jsonify({"error": "'entropy_group' must be a non-negative integer"}), 400
 
     rules = load_rules()
     rules[rule_id] = {
@@ -145,6 +309,12 @@ def add_update_rule(rule_id):
         "severity": severity,
         "description": description
     }
+    if triggers:
+        rules[rule_id]["triggers"] = triggers
+    if min_entropy is not None:
+        rules[rule_id]["min_entropy"] = min_entropy
+    if entropy_group is not None:
+        rules[rule_id]["entropy_group"] = entropy_group
     
     if save_rules(rules):
         return jsonify({"status": "success", "message": f"Rule '{rule_id}' saved."})
@@ -167,9 +337,16 @@ def delete_rule(rule_id):
 if __name__ == '__main__':
     HOST = '127.0.0.1'
     PORT = 8000
+    # Each scan holds its request thread for the whole clone + scan, so serve
+    # requests from a pool of threads to keep other scans and the UI responsive
+    THREADS = 8
     print("---------------------------------------------------------")
     print("🚀 SecureScan API Service starting...")
     print(f"   Listening on http://{HOST}:{PORT}")
     print(f"   Example Scan URL: https://github.com/OWASP/NodeGoat.git") 
     print("---------------------------------------------------------")
-    app.run(host=HOST, port=PORT, debug=True, use_reloader=False)
\ No newline at end of file
+    if os.environ.get('FLASK_ENV') == 'development':
+        app.run(host=HOST, port=PORT, debug=True, use_reloader=False)
+    else:
+        from waitress import serve
+        serve(app, host=HOST, port=PORT, threads=THREADS)
\ No newline at end of file
@@ -1,13 +1,72 @@
 import os
 import shutil
+import uuid
 import datetime
-from git.repo import Repo
-from git.exc import GitCommandError
+import time
+import subprocess
 from urllib.parse import urlparse
 
+from secret_scanner import IGNORED_DIRS, IGNORED_EXTENSIONS
+
+try:
+    # Optional: libgit2 bindings, to clone in-process instead of running git
+    import pygit2
+except ImportError:
+    pygit2 = None
+
 # Global temporary directory for cloned repos
 TEMP_DIR = os.path.join(os.path.expanduser('~'), 'AppData', 'Local', 'Temp', 'securescan_repos')
 
+# Maximum time (in seconds) a single clone may take before it is aborted
+CLONE_TIMEOUT = 300
+
+# Environment for git: never prompt for credentials (there is no one to answer),
+# and abort transfers that stay below 1 KB/s for 30 seconds
+GIT_ENV = dict(
+    os.environ,
+    GIT_TERMINAL_PROMPT='0',
+    GIT_HTTP_LOW_SPEED_LIMIT='1000',
+    GIT_HTTP_LOW_SPEED_TIME='30',
+)
+
+# Sparse-checkout patterns (gitignore syntax) leaving out what the scanner skips
+# anyway, so their blobs are never fetched
+SPARSE_CHECKOUT_PATTERNS = (
+    ['/*']
+    + [f'!{d}/' for d in sorted(IGNORED_DIRS) if d != '.git']
+    + [f'!*{ext}' for ext in sorted(IGNORED_EXTENSIONS)]
+)
+
+# Set SECURESCAN_USE_PYGIT2=1 to clone with pygit2 instead of the git command.
+# It saves starting three git processes per clone, which adds up when cloning
+# many small repositories, but libgit2 cannot make partial or sparse clones,
+# so every file of the latest commit is downloaded
+USE_PYGIT2 = os.environ.get('SECURESCAN_USE_PYGIT2', '').lower() in ('1', 'true', 'yes')
+if USE_PYGIT2 and pygit2 is None:
+    print("[WARNING] SECURESCAN_USE_PYGIT2 is set but pygit2 is not installed; using the git command.")
+
+# Errors raised by pygit2 (nothing to catch when it is not installed)
+_PYGIT2_ERRORS = (pygit2.GitError,) if pygit2 is not None else ()
+
+if USE_PYGIT2 and pygit2 is not None:
+    # libgit2 has no overall timeout, so bound connecting and each read (in ms).
+    # Older pygit2 releases lack these settings
+    if hasattr(pygit2.settings, 'server_connect_timeout'):
+        pygit2.settings.server_connect_timeout = 30000
+    if hasattr(pygit2.settings, 'server_timeout'):
+        pygit2.settings.server_timeout = 30000
+
+def _run_git(args, deadline):
+    """Runs a git command, allowing it whatever is left of the clone's time budget."""
+    return subprocess.run(
+        ['git', '-c', 'http.version=HTTP/2'] + args,
+        check=True,
+        capture_output=True,
+        text=True,
+        env=GIT_ENV,
+        timeout=max(deadline - time.monotonic(), 0)
+    )
+
 def clone_repo(repo_url):
     """
     Clones a Git repository from a URL into a unique temporary folder.
@@ -27,9 +86,10 @@ def clone_repo(repo_url):
     if repo_name.endswith('.git'):
         repo_name = repo_name[:-4]
 
-    # 2. Create a unique path for the cloned repo
+    # 2. Create a unique path for the cloned repo (clones may run concurrently,
+    #    so the timestamp alone is not enough)
     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
-    local_repo_path = os.path.join(TEMP_DIR, f"{repo_name}_{timestamp}")
+    local_repo_path = os.path.join(TEMP_DIR, f"{repo_name}_{timestamp}_{uuid.uuid4().hex[:8]}")
 
     print(f"[REPO] Attempting to clone {repo_url} into {local_repo_path}")
 
@@ -37,18 +97,36 @@ def clone_repo(repo_url):
         # Create the temporary directory if it doesn't exist
         os.makedirs(TEMP_DIR, exist_ok=True)
 
-        # 3. Perform the clone operation (shallow clone for speed is disabled 
-        #    here for full repository scan capability, but could be added later)
-        Repo.clone_from(
-            repo_url, 
-            local_repo_path,
-            progress=None, # Suppress clone progress output
-            multi_options=['--depth 1'] # Shallow clone for speed, fetching only the latest commit
+        # 3. Perform the clone operation: only the latest commit of the default
+        #    branch
+        if USE_PYGIT2 and pygit2 is not None:
+            pygit2.clone_repository(repo_url, local_repo_path, depth=1)
+            print(f"[REPO] Successfully cloned {repo_url}")
+            return local_repo_path
+
+        #    With git, blobs are fetched on demand (partial clone) and only for
+        #    the files that are checked out
+        deadline = time.monotonic() + CLONE_TIMEOUT
+        _run_git(
+            [
+                'clone',
+                '--depth=1',
+                '--filter=blob:none',
+                '--no-checkout',
+                '--single-branch',
+                '--no-tags',
+                '--quiet',
+                repo_url,
+                local_repo_path
+            ],
+            deadline
         )
+        _run_git(['-C', local_repo_path, 'sparse-checkout', 'set', '--no-cone'] + SPARSE_CHECKOUT_PATTERNS, deadline)
+        _run_git(['-C', local_repo_path, 'checkout', '--quiet'], deadline)
         print(f"[REPO] Successfully cloned {repo_url}")
         return local_repo_path
         
-    except GitCommandError as e:
+    except subprocess.CalledProcessError as e:
         # Catch specific Git errors (like 'Repository not found')
         error_message = f"Git command failed during clone: {e.stderr.strip()}"
         print(f"[REPO] Git command failed: {error_message}")
@@ -56,6 +134,18 @@ def clone_repo(repo_url):
         if os.path.exists(local_repo_path):
             cleanup_repo(local_repo_path)
         raise Exception(error_message)
+    except _PYGIT2_ERRORS as e:
+        error_message = f"Git clone failed: {e}"
+        print(f"[REPO] {error_message}")
+        if os.path.exists(local_repo_path):
+            cleanup_repo(local_repo_path)
+        raise Exception(error_message)
+    except subprocess.TimeoutExpired:
+        error_message = f"Git clone timed out after {CLONE_TIMEOUT} seconds"
+        print(f"[REPO] {error_message}")
+        if os.path.exists(local_repo_path):
+            cleanup_repo(local_repo_path)
+        raise Exception(error_message)
     except Exception as e:
         # Catch other exceptions (e.g., directory creation, permissions)
         error_message = f"An unexpected error occurred during cloning: {e}"
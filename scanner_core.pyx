@@ -0,0 +1,72 @@
+# cython: boundscheck=False, wraparound=False, language_level=3
+"""
+Compiled scan loop for SecretScanner (see SecretScanner._scan_buffer_re).
+
+Build it in place with:
+
+    python setup.py build_ext --inplace
+
+secret_scanner.py falls back to the pure-Python loop when it is not built.
+"""
+from libc.string cimport memchr
+
+
+def scan_buffer(buf, list search_groups, list rule_patterns):
+    """
+    Searches the contents of a file once per group of rules.
+
+    Line numbers are tracked with memchr as the search moves forward, so no
+    table of line offsets has to be built for the whole file.
+
+    Args:
+        buf (bytes or mmap): The contents of the file.
+        search_groups (list): (pattern, rule_ids) pairs to search the buffer with.
+        rule_patterns (list): The compiled pattern of each rule, by rule id.
+
+    Returns:
+        list: (line_num, rule_id, line_start, line_end) for each rule hit.
+    """
+    cdef const unsigned char[::1] view = buf
+    cdef Py_ssize_t n = view.shape[0]
+    cdef const unsigned char* data
+    cdef const unsigned char* nl
+    cdef Py_ssize_t line_num, lo, hi, start
+    cdef list hits = []
+
+    if n == 0:
+        return hits
+    data = &view[0]
+
+    for pattern, rule_ids in search_groups:
+        line_num = 1
+        lo = 0
+        match = pattern.search(buf, 0)
+        while match is not None:
+            start = match.start()
+
+            # Move to the line containing the match
+            nl = <const unsigned char*>memchr(data + lo, b'\n', start - lo)
+            while nl != NULL:
+                line_num += 1
+                lo = nl - data + 1
+                nl = <const unsigned char*>memchr(data + lo, b'\n', start - lo)
+
+            nl = <const unsigned char*>memchr(data + start, b'\n', n - start)
+            hi = n if nl == NULL else nl - data + 1
+
+            if len(rule_ids) == 1 and match.end() <= hi:
+                # A rule searched on its own that matched within the line
+                hits.append((line_num, rule_ids[0], lo, hi))
+            else:
+                for rule_id in rule_ids:
+                    if rule_patterns[rule_id].search(buf, lo, hi):
+                        hits.append((line_num, rule_id, lo, hi))
+
+            if hi >= n:
+                break
+            # Resume at the next line so each rule is reported once per line
+            line_num += 1
+            lo = hi
+            match = pattern.search(buf, hi)
+
+    return hits
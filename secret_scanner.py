@@ -1,94 +1,1015 @@
 import re
 import os
-from collections import namedtuple
+import sys
+import json
+import mmap
+import math
+import hashlib
+import threading
+import multiprocessing
+from array import array
+from bisect import bisect_right
+from collections import Counter, deque
+from dataclasses import dataclass
+from itertools import repeat
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-# Named tuple for clear representation of a finding
-Finding = namedtuple('Finding', ['secret_type', 'file', 'line', 'excerpt', 'severity'])
+try:
+    # Optional: Hyperscan matches every rule in a single pass over the file
+    import hyperscan as hs
+except ImportError:
+    hs = None
+
+try:
+    # Optional: NumPy finds line breaks with vectorized (SIMD) comparisons
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    # Optional: RE2 matches in linear time, with no catastrophic backtracking
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # Optional: compiled scan loop, built with `python setup.py build_ext --inplace`
+    import scanner_core
+except ImportError:
+    scanner_core = None
+
+try:
+    # Optional: PCRE2 with its JIT compiler, for rules needing PCRE features
+    import pcre2
+except ImportError:
+    pcre2 = None
+
+try:
+    # Optional: Numba compiles the mapping of match offsets to lines
+    from numba import njit
+except ImportError:
+    njit = None
+
+try:
+    # Optional: Aho-Corasick looks for every rule's trigger words in one pass
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+@dataclass
+class Finding:
+    """
+    A secret found in a file. Slots keep each of the (possibly many
+    thousands of) findings of a scan small and cheap to create.
+    """
+    __slots__ = ('secret_type', 'file', 'line', 'excerpt', 'severity')
+
+    secret_type: str
+    file: str
+    line: int
+    excerpt: str
+    severity: str
+
+    def to_dict(self):
+        """Returns the finding as a dictionary, e.g. for JSON responses."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+# Number of threads reading files ahead of the scanner, and how many files, and
+# bytes, may be read (and held in memory) before the scanner catches up
+READ_WORKERS = 8
+READ_QUEUE_DEPTH = 64
+READ_AHEAD_BYTES = 64 * 1024 * 1024
+
+# Directories with fewer files than this are scanned in-process, since starting
+# the worker processes would cost more than the scan itself
+PROCESS_POOL_MIN_FILES = 256
+PROCESS_POOL_CHUNKSIZE = 32
+
+# Files with a NUL byte within this many leading bytes are treated as binary
+BINARY_SNIFF_BYTES = 4096
+
+# Hyperscan reports every offset at which a match ends, so a rule with an
+# unbounded tail (such as `.*`) reports once per byte after its keyword. A file
+# reporting more match ends than HYPERSCAN_MIN_MATCHES plus one per
+# HYPERSCAN_BYTES_PER_MATCH bytes is searched line by line instead
+HYPERSCAN_MIN_MATCHES = 4096
+HYPERSCAN_BYTES_PER_MATCH = 64
+
+# Files larger than this (e.g. committed logs or SQL dumps) are scanned in
+# tiles of TILE_SIZE bytes, so memory use does not grow with the file size.
+# A line too long for one tile is split, with TILE_OVERLAP bytes scanned twice
+LARGE_FILE_THRESHOLD = 8 * 1024 * 1024
+TILE_SIZE = 1024 * 1024
+TILE_OVERLAP = 1024
+
+# Returned by _read_file in place of the contents of a large file
+_LARGE_FILE = object()
+
+# Compiled rules by _rules_key, shared by every scanner in the process:
+# (compiled_rules, id_to_type, rule_patterns, search_groups, hyperscan db,
+#  hyperscan prefilter db, rule_triggers, trigger automaton)
+_COMPILED_CACHE = {}
+COMPILED_CACHE_SIZE = 8
+
+# Common directories to ignore to improve performance and relevance
+IGNORED_DIRS = frozenset(['.git', '__pycache__', 'node_modules', 'venv', '.vscode'])
+
+# Well-known binary formats, skipped without opening them (any other binary
+# file is still detected from its contents in _scan_buffer)
+IGNORED_EXTENSIONS = frozenset(['.jpg', '.jpeg', '.png', '.gif', '.bin', '.exe', '.dll', '.zip', '.tar', '.gz'])
+
+def _make_excerpt(line):
+    """Strips a line and truncates it to 80 characters for the display."""
+    excerpt = line.strip()
+    if len(excerpt) > 80:
+        excerpt = excerpt[:77] + '...'
+    return excerpt
+
+def _walk(dirpath, relative_dir=''):
+    """
+    Recursively lists the files to scan under a directory.
+
+    os.scandir reports whether each entry is a file or a directory from the
+    directory listing itself, so unlike os.walk no entry needs a stat() call.
+    Symbolic links are not followed, so a cloned repository cannot point the
+    scanner at files outside of it.
+
+    Args:
+        dirpath (str): The full path of the directory to list.
+        relative_dir (str): The path of the directory relative to the scanned root.
+
+    Yields:
+        tuple: (full path, path relative to the scanned root) of each file.
+    """
+    subdirs = []
+    try:
+        with os.scandir(dirpath) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORED_DIRS:
+                        subdirs.append(entry)
+                elif entry.is_file(follow_symlinks=False):
+                    if os.path.splitext(entry.name)[1].lower() not in IGNORED_EXTENSIONS:
+                        yield entry.path, relative_dir + entry.name
+    except OSError as e:
+        # Skip directories that cannot be listed (e.g., permission issues), like os.walk
+        print(f"[WARNING] Could not read directory {dirpath}: {e}")
+        return
+
+    # Descend once the listing is closed, so only one directory is open at a time
+    for entry in subdirs:
+        yield from _walk(entry.path, relative_dir + entry.name + os.sep)
+
+class _Pcre2Pattern:
+    """
+    Wraps a JIT-compiled PCRE2 pattern so it can search memory-mapped files.
+
+    PCRE2 rejects mmap objects but accepts a memoryview over them, which
+    does not copy the file. Searches the JIT cannot complete (e.g. when its
+    stack limit is reached on a very long line) are retried with RE2 or re.
+    """
+    __slots__ = ('pattern', 'source', 'fallback')
+
+    def __init__(self, pattern, source):
+        self.pattern = pattern
+        self.source = source
+        self.fallback = None
+
+    def search(self, buf, pos=0, endpos=sys.maxsize):
+        try:
+            return self.pattern.search(memoryview(buf) if isinstance(buf, mmap.mmap) else buf, pos, endpos)
+        except pcre2.LibraryError:
+            if self.fallback is None:
+                # RE2 if it supports the pattern (it needs no stack), else re
+                compiled = _compile_re2(self.source) if re2 is not None else None
+                self.fallback = compiled if compiled is not None else re.compile(self.source, re.MULTILINE)
+            return self.fallback.search(buf, pos, endpos)
+
+    @property
+    def groups(self):
+        """The number of capture groups in the pattern."""
+        return self.pattern.groups
+
+def _compile_pattern(pattern, use_pcre2_jit=False):
+    """
+    Compiles a rule pattern to run over the raw bytes of a file.
+
+    With use_pcre2_jit set, PCRE2 compiles the pattern to native code. Otherwise
+    RE2 is used when it is installed. Patterns these engines cannot handle
+    (such as backreferences or lookarounds for RE2) are compiled with the re
+    module instead.
+
+    Raises:
+        re.error: If the pattern is not a valid regular expression.
+    """
+    pattern = pattern.encode()
+    if use_pcre2_jit and pcre2 is not None:
+        try:
+            return _Pcre2Pattern(pcre2.compile(pattern, pcre2.MULTILINE, jit=True), pattern)
+        except pcre2.error:
+            pass
+    if re2 is not None:
+        compiled = _compile_re2(pattern)
+        if compiled is not None:
+            return compiled
+    return re.compile(pattern, re.MULTILINE)
+
+def _compile_re2(pattern):
+    """Compiles a bytes pattern with RE2, returning None if RE2 cannot handle it."""
+    options = re2.Options()
+    # Match bytes one-to-one like the re module does, and stay quiet on
+    # patterns that fall back to another engine
+    options.encoding = re2.Options.Encoding.LATIN1
+    options.log_errors = False
+    try:
+        return re2.compile(b'(?m)' + pattern, options=options)
+    except re2.error:
+        return None
+
+def _shannon_entropy(data):
+    """Returns the Shannon entropy of a byte string, in bits per byte (0 to 8)."""
+    if not data:
+        return 0.0
+    if np is not None:
+        # Histogram of byte values in one vectorized pass
+        p = np.bincount(np.frombuffer(data, dtype=np.uint8), minlength=256) / len(data)
+        p = p[p > 0]
+        return float(-(p * np.log2(p)).sum())
+    n = len(data)
+    return -sum(c / n * math.log2(c / n) for c in Counter(data).values())
+
+def _rules_key(rules, use_pcre2_jit):
+    """
+    Returns the key of a set of rules in _COMPILED_CACHE.
+
+    Only the patterns, their triggers and the engine affect what is compiled,
+    so editing a rule's severity or description does not force a recompile.
+    """
+    patterns = {
+        secret_type: [rule_data['pattern'], rule_data.get('triggers') or []]
+        for secret_type, rule_data in rules.items()
+    }
+    canonical = json.dumps([patterns, bool(use_pcre2_jit)], sort_keys=True)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+
+def _line_starts(buf):
+    """Returns the byte offset at which each line of the buffer starts."""
+    if np is not None:
+        newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 0x0A)
+        starts = [0]
+        starts.extend((newlines + 1).tolist())
+        return starts
+
+    starts = array('Q', [0])
+    pos = buf.find(b'\n')
+    while pos != -1:
+        starts.append(pos + 1)
+        pos = buf.find(b'\n', pos + 1)
+    return starts
+
+def _line_end(line_starts, line_num, buf_len):
+    """Returns the offset just past the end of a line (including its newline)."""
+    return line_starts[line_num] if line_num < len(line_starts) else buf_len
+
+if njit is not None and np is not None:
+    @njit(cache=True)
+    def _map_offsets_kernel(buf, offsets):
+        """Compiled version of _map_offsets, taking the offsets as an int64 array."""
+        n_lines = 1
+        for i in range(len(buf)):
+            if buf[i] == 10:
+                n_lines += 1
+        starts = np.empty(n_lines + 1, np.int64)
+        starts[0] = 0
+        line = 1
+        for i in range(len(buf)):
+            if buf[i] == 10:
+                starts[line] = i + 1
+                line += 1
+        # One past the last line, so every line has a following start
+        starts[n_lines] = len(buf)
+
+        line_nums = np.searchsorted(starts[:n_lines], offsets, side='right')
+        return line_nums, starts[line_nums - 1], starts[line_nums]
+else:
+    _map_offsets_kernel = None
+
+def _map_offsets(buf, offsets):
+    """
+    Finds the line holding each of a list of byte offsets.
+
+    Args:
+        buf (bytes or mmap): The contents of the file.
+        offsets (list): Byte offsets into buf.
+
+    Returns:
+        tuple: Lists of the line number, line start and line end (past its
+               newline) for each offset.
+    """
+    if _map_offsets_kernel is not None:
+        # bytes and mmap are passed as they are: Numba dispatches on them much
+        # faster than on a read-only NumPy view of them
+        line_nums, los, his = _map_offsets_kernel(buf, np.array(offsets, dtype=np.int64))
+        return line_nums.tolist(), los.tolist(), his.tolist()
+
+    if np is not None:
+        newlines = np.flatnonzero(np.frombuffer(buf, dtype=np.uint8) == 0x0A)
+        starts = np.concatenate(([0], newlines + 1, [len(buf)]))
+        line_nums = np.searchsorted(starts[:-1], offsets, side='right')
+        return line_nums.tolist(), starts[line_nums - 1].tolist(), starts[line_nums].tolist()
+
+    line_starts = _line_starts(buf)
+    line_nums = [bisect_right(line_starts, offset) for offset in offsets]
+    return (line_nums,
+            [line_starts[line_num - 1] for line_num in line_nums],
+            [_line_end(line_starts, line_num, len(buf)) for line_num in line_nums])
+
+def _is_binary(buf):
+    """
+    Returns whether a file looks binary (image, archive, compiled object, ...):
+    text never contains NUL bytes, and find() on bytes/mmap runs as memchr.
+    """
+    return buf.find(b'\x00', 0, BINARY_SNIFF_BYTES) != -1
+
+def _read_file(filepath, reserve=None):
+    """
+    Reads a whole file as bytes, returning None if it cannot be read, or
+    _LARGE_FILE if it is too large to be read at once. If given, reserve is
+    called with the size of the file before it is read.
+    """
+    try:
+        with open(filepath, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size > LARGE_FILE_THRESHOLD:
+                return _LARGE_FILE
+            if reserve is not None:
+                reserve(size)
+            return f.read()
+    except OSError as e:
+        # Skip files that cannot be read (e.g., permission issues)
+        print(f"[WARNING] Could not read file {filepath}: {e}")
+        return None
+
+def _read_files(filepaths):
+    """
+    Reads files on a thread pool so that disk latency overlaps with scanning.
+
+    Up to READ_QUEUE_DEPTH reads are kept in flight, and a worker waits before
+    reading a file that would take the files read but not yet consumed over
+    READ_AHEAD_BYTES, so a run of large files does not pile up in memory. The
+    next file to be yielded is always read, so a file larger than that is
+    still scanned. Results are yielded in the same order as the given paths.
+
+    Args:
+        filepaths (list): The full paths of the files to read.
+
+    Yields:
+        tuple: (filepath, contents) where contents is bytes, None or _LARGE_FILE.
+    """
+    # Bytes reserved by the workers for files not yet yielded, and the index
+    # of the next file to yield
+    read_ahead = 0
+    next_index = 0
+    closed = False
+    cond = threading.Condition()
+
+    def read(index, filepath):
+        reserved = 0
+
+        def reserve(size):
+            nonlocal read_ahead, reserved
+            with cond:
+                cond.wait_for(lambda: read_ahead + size <= READ_AHEAD_BYTES
+                              or index == next_index or closed)
+                read_ahead += size
+            reserved = size
+
+        return _read_file(filepath, reserve), reserved
+
+    def take(future):
+        nonlocal read_ahead, next_index
+        contents, reserved = future.result()
+        with cond:
+            read_ahead -= reserved
+            next_index += 1
+            cond.notify_all()
+        return contents
+
+    with ThreadPoolExecutor(max_workers=READ_WORKERS) as executor:
+        pending = deque()
+        try:
+            for index, filepath in enumerate(filepaths):
+                if len(pending) >= READ_QUEUE_DEPTH:
+                    path, future = pending.popleft()
+                    yield path, take(future)
+                pending.append((filepath, executor.submit(read, index, filepath)))
+            while pending:
+                path, future = pending.popleft()
+                yield path, take(future)
+        finally:
+            # If the caller stops early, release the waiting workers so the
+            # executor can shut down
+            with cond:
+                closed = True
+                cond.notify_all()
 
 class SecretScanner:
     """
     Core class for scanning a directory for secrets based on regex rules.
     """
-    def __init__(self, rules):
+    def __init__(self, rules, use_pcre2_jit=False):
         """
         Initializes the scanner with a dictionary of rules.
         
         Args:
             rules (dict): A dictionary where keys are rule IDs (secret_type) and 
                           values are dictionaries containing 'pattern' (regex) and 'severity'.
+            use_pcre2_jit (bool): Compile the rules with PCRE2's JIT (requires the
+                                  pcre2 package; ignored if it is not installed).
         """
+        if use_pcre2_jit and pcre2 is None:
+            print("[WARNING] use_pcre2_jit is set but pcre2 is not installed; using the default engine.")
         self.rules = rules
+        self.use_pcre2_jit = use_pcre2_jit
         self.compiled_rules = {}
+        self.db = None
+        self.prefilter_db = None
+        self.id_to_type = {}
+        self.rule_patterns = []
+        self.search_groups = []
+        self.rule_triggers = {}
+        self.trigger_automaton = None
+        self.rule_min_entropy = {}
+        self.rule_entropy_group = {}
+        self._local = threading.local()
         self._compile_rules()
         print(f"[SCANNER] Initialized with {len(self.rules)} rules.")
 
     def _compile_rules(self):
         """
         Compiles the regex patterns for efficiency and stores them.
+
+        Compiled rules are cached per process (see _COMPILED_CACHE), so a
+        scanner built again from the same patterns, such as after rules.json
+        is saved with an unchanged pattern, skips the regex compilers. The
+        min_entropy thresholds are read again each time, since they are not
+        part of the cache key.
+        """
+        key = _rules_key(self.rules, self.use_pcre2_jit)
+        compiled = _COMPILED_CACHE.get(key)
+        if compiled is None:
+            self._compile_patterns()
+            self._compile_triggers()
+            compiled = (self.compiled_rules, self.id_to_type, self.rule_patterns,
+                        self.search_groups, self.db, self.prefilter_db,
+                        self.rule_triggers, self.trigger_automaton)
+            _COMPILED_CACHE[key] = compiled
+            # Keep the cache bounded by evicting the least recently compiled rules
+            while len(_COMPILED_CACHE) > COMPILED_CACHE_SIZE:
+                del _COMPILED_CACHE[next(iter(_COMPILED_CACHE))]
+
+        (self.compiled_rules, self.id_to_type, self.rule_patterns,
+         self.search_groups, self.db, self.prefilter_db,
+         self.rule_triggers, self.trigger_automaton) = compiled
+        self._load_min_entropy()
+
+    def _compile_patterns(self):
+        """
+        Compiles each rule's pattern with the fastest engine available.
+
+        With RE2, the patterns are also joined into a single alternation so
+        each file is searched once for all rules. When Hyperscan is installed,
+        they are instead compiled into one multi-pattern database, along with
+        a single-match copy of it that only tells which rules match a file.
         """
+        self.compiled_rules = {}
         for secret_type, rule_data in self.rules.items():
             try:
                 # Compile the regex pattern
                 pattern = rule_data['pattern']
-                self.compiled_rules[secret_type] = re.compile(pattern)
+                self.compiled_rules[secret_type] = _compile_pattern(pattern, self.use_pcre2_jit)
             except re.error as e:
                 print(f"[ERROR] Failed to compile regex for rule '{secret_type}': {e}")
 
-    def _scan_file(self, filepath):
+        self.id_to_type = dict(enumerate(self.compiled_rules))
+        # Compiled patterns indexed by rule id, for the scan loops
+        self.rule_patterns = list(self.compiled_rules.values())
+        self._compile_search_groups()
+
+        self.db = None
+        self.prefilter_db = None
+        if hs is None or not self.compiled_rules:
+            return
+
+        secret_types = list(self.compiled_rules)
+        expressions = [self.rules[t]['pattern'].encode() for t in secret_types]
+        try:
+            db = hs.Database()
+            db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[hs.HS_FLAG_MULTILINE] * len(expressions)
+            )
+            prefilter_db = hs.Database()
+            prefilter_db.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=[hs.HS_FLAG_MULTILINE | hs.HS_FLAG_SINGLEMATCH] * len(expressions)
+            )
+        except hs.HyperscanError as e:
+            # Some constructs (e.g. backreferences) are not supported by Hyperscan
+            print(f"[WARNING] Hyperscan could not compile the rules, falling back to re: {e}")
+            return
+
+        self.db = db
+        self.prefilter_db = prefilter_db
+
+    def _compile_search_groups(self):
+        """
+        Groups the rules into the patterns searched over each file.
+
+        Rules that RE2 supports are joined into one alternation, which RE2
+        matches in a single pass. The remaining rules are searched on their
+        own: backtracking engines try each alternative in turn, so joining
+        their patterns would only be slower. Each group is a (pattern,
+        rule_ids) pair.
+        """
+        fused_ids = []
+        if re2 is not None and not self.use_pcre2_jit:
+            fused_ids = [
+                rule_id for rule_id, secret_type in self.id_to_type.items()
+                if _compile_re2(self.rules[secret_type]['pattern'].encode()) is not None
+            ]
+
+        self.search_groups = []
+        if len(fused_ids) > 1:
+            fused_pattern = '|'.join(
+                f"(?:{self.rules[self.id_to_type[rule_id]]['pattern']})" for rule_id in fused_ids
+            )
+            fused = _compile_re2(fused_pattern.encode())
+            if fused is not None:
+                self.search_groups.append((fused, fused_ids))
+            else:
+                fused_ids = []
+        else:
+            fused_ids = []
+
+        for rule_id, secret_type in self.id_to_type.items():
+            if rule_id not in fused_ids:
+                self.search_groups.append((self.rule_patterns[rule_id], [rule_id]))
+
+    def _load_min_entropy(self):
+        """
+        Reads the optional 'min_entropy' and 'entropy_group' of each rule.
+
+        Secrets are random, so their values have high entropy, while the
+        value of a line like SECRET_NAME = "name" does not. A rule with a
+        min_entropy (in bits per byte) is only reported on a line where one
+        of its matches reaches it; rules without one are always reported.
+        Only the capture group numbered by entropy_group is scored, so a
+        keyword matched before the value does not raise the score; without
+        it, the whole match is.
+        """
+        self.rule_min_entropy = {}
+        self.rule_entropy_group = {}
+        for rule_id, secret_type in self.id_to_type.items():
+            min_entropy = self.rules[secret_type].get('min_entropy')
+            if min_entropy is None:
+                continue
+            try:
+                min_entropy = float(min_entropy)
+            except (TypeError, ValueError):
+                print(f"[ERROR] Invalid min_entropy for rule '{secret_type}': {min_entropy!r}")
+                continue
+            group = self.rules[secret_type].get('entropy_group', 0)
+            if isinstance(group, bool) or not isinstance(group, int) or not 0 <= group <= self.rule_patterns[rule_id].groups:
+                print(f"[ERROR] Invalid entropy_group for rule '{secret_type}': {group!r}")
+                continue
+            self.rule_min_entropy[rule_id] = min_entropy
+            self.rule_entropy_group[rule_id] = group
+
+    def _has_entropy(self, buf, rule_id, lo, hi):
+        """Returns whether a match of the rule within buf[lo:hi] reaches its min_entropy."""
+        min_entropy = self.rule_min_entropy[rule_id]
+        group = self.rule_entropy_group[rule_id]
+        pattern = self.rule_patterns[rule_id]
+        match = pattern.search(buf, lo, hi)
+        while match:
+            # An unmatched group spans (-1, -1), which scores as empty
+            if _shannon_entropy(buf[match.start(group):match.end(group)]) >= min_entropy:
+                return True
+            pos = max(match.end(), match.start() + 1)
+            if pos >= hi:
+                break
+            match = pattern.search(buf, pos, hi)
+        return False
+
+    def _compile_triggers(self):
+        """
+        Collects the trigger words of the rules that are searched on their own.
+
+        A rule may list 'triggers': literal strings, at least one of which
+        appears in every match of its pattern. A file containing none of them
+        cannot match, so the rule's search over that file is skipped. This
+        only pays off for rules searched one by one with a backtracking
+        engine; Hyperscan and the fused RE2 search already check every rule
+        in a single pass, so their rules are always searched.
+        """
+        self.rule_triggers = {}
+        self.trigger_automaton = None
+        if self.db is not None:
+            return
+
+        for pattern_compiled, rule_ids in self.search_groups:
+            triggers = self.rules[self.id_to_type[rule_ids[0]]].get('triggers')
+            if len(rule_ids) == 1 and triggers:
+                self.rule_triggers[rule_ids[0]] = [t.encode() for t in triggers]
+
+        if ahocorasick is None or not self.rule_triggers:
+            return
+
+        # Map each trigger to the rules it enables. The automaton works on
+        # str, so triggers and file contents are both decoded as Latin-1,
+        # which maps each byte to one character
+        trigger_rules = {}
+        for rule_id, triggers in self.rule_triggers.items():
+            for trigger in triggers:
+                trigger_rules.setdefault(trigger.decode('latin-1'), []).append(rule_id)
+        automaton = ahocorasick.Automaton()
+        for trigger, rule_ids in trigger_rules.items():
+            automaton.add_word(trigger, rule_ids)
+        automaton.make_automaton()
+        self.trigger_automaton = automaton
+
+    def _triggered_rules(self, buf):
+        """
+        Returns the ids of the rules with triggers whose triggers appear in a file.
+
+        Args:
+            buf (bytes or mmap): The contents of the file.
+
+        Returns:
+            set: The rule ids that must be searched.
+        """
+        triggered = set()
+        if self.trigger_automaton is not None:
+            for _, rule_ids in self.trigger_automaton.iter(str(buf, 'latin-1')):
+                triggered.update(rule_ids)
+                if len(triggered) == len(self.rule_triggers):
+                    break
+            return triggered
+
+        for rule_id, triggers in self.rule_triggers.items():
+            if any(buf.find(trigger) != -1 for trigger in triggers):
+                triggered.add(rule_id)
+        return triggered
+
+    def _scratch(self, db):
+        """
+        Returns the Hyperscan scratch space of a database for the current thread.
+
+        Scratch space cannot be shared between concurrent scans, so one is
+        allocated per thread and database, and reallocated whenever the
+        databases change.
+        """
+        if getattr(self._local, 'db', None) is not self.db:
+            self._local.scratches = {}
+            self._local.db = self.db
+        scratch = self._local.scratches.get(id(db))
+        if scratch is None:
+            scratch = self._local.scratches[id(db)] = hs.Scratch(db)
+        return scratch
+
+    def _build_findings(self, buf, hits, filepath):
+        """
+        Creates the findings for a file from the rule hits.
+
+        Args:
+            buf (bytes): The contents of the file.
+            hits (iterable): (line_num, rule_id, line_start, line_end) tuples,
+                             one per finding.
+            filepath (str): The path reported in each finding.
+
+        Returns:
+            list: A list of Finding objects, ordered by line and rule.
+        """
+        findings = []
+        for line_num, rule_id, lo, hi in sorted(hits):
+            if rule_id in self.rule_min_entropy and not self._has_entropy(buf, rule_id, lo, hi):
+                continue
+            secret_type = self.id_to_type[rule_id]
+            findings.append(Finding(
+                secret_type=secret_type,
+                file=filepath,
+                line=line_num,
+                # Truncate the excerpt to 80 characters for the display
+                excerpt=_make_excerpt(buf[lo:hi].decode('utf-8', errors='ignore')),
+                severity=self.rules[secret_type].get('severity', 'Unknown')
+            ))
+        return findings
+
+    def _scan_buffer_hyperscan(self, buf):
+        """
+        Scans the contents of a file with the Hyperscan database in one pass.
+
+        Hyperscan reports where matches end, and a match may run across line
+        breaks, so every line a match ends on is only a candidate: it is then
+        confirmed with the rule's compiled regex to keep line-based results.
+
+        Files reporting too many match ends (see HYPERSCAN_MIN_MATCHES) are
+        handed over to _scan_buffer_prefiltered, which bounds the callbacks.
+
+        Args:
+            buf (bytes): The contents of the file.
+
+        Returns:
+            list: (line_num, rule_id, line_start, line_end) for each rule hit.
+        """
+        ends = []
+        rule_ids = []
+        max_matches = HYPERSCAN_MIN_MATCHES + len(buf) // HYPERSCAN_BYTES_PER_MATCH
+
+        def on_match(rule_id, start, end, flags, context):
+            # Record the last byte of the match, which is on the line it ends on
+            ends.append(end - 1)
+            rule_ids.append(rule_id)
+            # Returning True stops the scan
+            return len(ends) > max_matches
+
+        try:
+            self.db.scan(buf, match_event_handler=on_match, scratch=self._scratch(self.db))
+        except hs.ScanTerminated:
+            return self._scan_buffer_prefiltered(buf)
+        if not ends:
+            return []
+
+        # Map all the offsets to lines in one pass over the file, then check
+        # each rule at most once per line, like the line-based scan
+        line_nums, line_los, line_his = _map_offsets(buf, ends)
+        candidates = set(zip(line_nums, rule_ids, line_los, line_his))
+
+        hits = []
+        for line_num, rule_id, lo, hi in candidates:
+            if self.rule_patterns[rule_id].search(buf, lo, hi):
+                hits.append((line_num, rule_id, lo, hi))
+        return hits
+
+    def _scan_buffer_prefiltered(self, buf):
+        """
+        Scans the contents of a file line by line, for the rules Hyperscan finds in it.
+
+        The single-match database reports each rule at most once per file, so
+        this scan makes at most one callback per rule.
+
+        Args:
+            buf (bytes): The contents of the file.
+
+        Returns:
+            list: (line_num, rule_id, line_start, line_end) for each rule hit.
+        """
+        matched = set()
+
+        def on_match(rule_id, start, end, flags, context):
+            matched.add(rule_id)
+
+        self.prefilter_db.scan(buf, match_event_handler=on_match, scratch=self._scratch(self.prefilter_db))
+        if not matched:
+            return []
+        search_groups = [group for group in self.search_groups if not matched.isdisjoint(group[1])]
+        return self._scan_groups(buf, search_groups)
+
+    def _scan_groups(self, buf, search_groups):
+        """Searches a buffer for the given groups with the compiled loop, if it is built."""
+        if scanner_core is not None:
+            return scanner_core.scan_buffer(buf, search_groups, self.rule_patterns)
+        return self._scan_buffer_re(buf, search_groups)
+
+    def _scan_buffer_re(self, buf, search_groups):
+        """
+        Scans the contents of a file by searching the whole buffer once per group.
+
+        Each match only marks its line as a candidate: the alternation reports
+        one rule per match, while several rules may match the same line. The
+        rules of the group are then checked against that line alone, and the
+        search resumes at the next line, so every rule is reported at most
+        once per line.
+
+        scanner_core.scan_buffer is a compiled version of this loop.
+
+        Args:
+            buf (bytes): The contents of the file.
+            search_groups (list): The (pattern, rule_ids) groups to search with.
+
+        Returns:
+            list: (line_num, rule_id, line_start, line_end) for each rule hit.
+        """
+        line_starts = _line_starts(buf)
+        hits = []
+        for pattern_compiled, rule_ids in search_groups:
+            match = pattern_compiled.search(buf, 0)
+            while match:
+                line_num = bisect_right(line_starts, match.start())
+                lo = line_starts[line_num - 1]
+                hi = _line_end(line_starts, line_num, len(buf))
+                if len(rule_ids) == 1 and match.end() <= hi:
+                    # A rule searched on its own that matched within the line
+                    hits.append((line_num, rule_ids[0], lo, hi))
+                else:
+                    for rule_id in rule_ids:
+                        if self.rule_patterns[rule_id].search(buf, lo, hi):
+                            hits.append((line_num, rule_id, lo, hi))
+                if hi >= len(buf):
+                    break
+                match = pattern_compiled.search(buf, hi)
+        return hits
+
+    def _scan_buffer(self, buf, filepath):
+        """
+        Scans the contents of a file for secrets matching any compiled rule.
+
+        Args:
+            buf (bytes or mmap): The contents of the file.
+            filepath (str): The path reported in each finding.
+
+        Returns:
+            list: A list of Finding objects.
+        """
+        if _is_binary(buf):
+            return []
+        return self._build_findings(buf, self._find_hits(buf), filepath)
+
+    def _find_hits(self, buf):
+        """
+        Finds the rule hits in a buffer with the fastest scan loop available.
+
+        Args:
+            buf (bytes or mmap): The contents of the file.
+
+        Returns:
+            list: (line_num, rule_id, line_start, line_end) for each rule hit.
+        """
+        if self.db is not None:
+            return self._scan_buffer_hyperscan(buf)
+
+        search_groups = self.search_groups
+        if self.rule_triggers:
+            # Skip the rules none of whose trigger words are in the file
+            skipped = self.rule_triggers.keys() - self._triggered_rules(buf)
+            search_groups = [group for group in search_groups if group[1][0] not in skipped]
+        return self._scan_groups(buf, search_groups)
+
+    def _scan_tiles(self, f, filepath):
+        """
+        Scans a large file one tile at a time.
+
+        Tiles end after their last newline, and the rest of the tile is carried
+        over to the next one, so every line is scanned whole, within a single
+        tile. Only a line longer than a tile is cut; the cut then keeps
+        TILE_OVERLAP bytes for the next tile, so a match across it is still
+        found, and findings are deduplicated by rule and line. Findings on
+        the rest of a cut line keep the excerpt of its start, as in a scan
+        of the whole file. A rule that matched on an earlier piece of the
+        line is not matched again on its later pieces: a scan of the whole
+        file would have decided it there, since a match reaching the end of
+        the line (as with `.*`) hides any later one from its min_entropy.
+
+        Args:
+            f (file): The file, opened in binary mode.
+            filepath (str): The path reported in each finding.
+
+        Returns:
+            list: A list of Finding objects.
+        """
+        findings = []
+        seen = set()
+        lines_before = 0
+        carry = b''
+        # Excerpt of the line cut at the end of the previous tile, if any,
+        # and the rules that matched on the pieces of it scanned so far
+        cut_line_excerpt = None
+        cut_line_rules = set()
+        first_tile = True
+        while True:
+            data = f.read(TILE_SIZE)
+            tile = carry + data if carry else data
+            if not tile:
+                break
+            if first_tile:
+                if _is_binary(tile):
+                    return []
+                first_tile = False
+
+            if not data:
+                # End of file: the rest is the last line
+                cut = carry_from = len(tile)
+            else:
+                cut = carry_from = tile.rfind(b'\n') + 1
+                if cut == 0:
+                    cut = len(tile)
+                    carry_from = max(cut - TILE_OVERLAP, 0)
+            chunk = tile[:cut]
+            hits = self._find_hits(chunk)
+            if cut_line_rules:
+                hits = [hit for hit in hits if hit[0] != 1 or hit[1] not in cut_line_rules]
+            if carry_from == cut:
+                line_excerpt = None
+                line_rules = set()
+            else:
+                # The tile holds no newline, so it is all one line
+                if cut_line_excerpt is None:
+                    # The tile starts with this line, so it holds the line's start
+                    line_excerpt = _make_excerpt(chunk.decode('utf-8', errors='ignore'))
+                else:
+                    line_excerpt = cut_line_excerpt
+                line_rules = cut_line_rules | {hit[1] for hit in hits}
+
+            for finding in self._build_findings(chunk, hits, filepath):
+                if cut_line_excerpt is not None and finding.line == 1:
+                    finding.excerpt = cut_line_excerpt
+                finding.line += lines_before
+                key = (finding.secret_type, finding.line)
+                if key not in seen:
+                    seen.add(key)
+                    findings.append(finding)
+
+            lines_before += chunk.count(b'\n')
+            carry = tile[carry_from:]
+            cut_line_excerpt = line_excerpt
+            cut_line_rules = line_rules
+            if not data:
+                break
+        return findings
+
+    def _scan_file(self, filepath, display_path=None):
         """
         Scans a single file for secrets matching any compiled rule.
 
+        The file is memory-mapped rather than read, so the regex engine works
+        directly on the page cache without copying the contents. Files over
+        LARGE_FILE_THRESHOLD are read in tiles instead (see _scan_tiles).
+
         Args:
             filepath (str): The full path to the file to scan.
+            display_path (str): The path reported in each finding (defaults to filepath).
 
         Returns:
-            list: A list of Finding named tuples.
+            list: A list of Finding objects.
         """
-        findings = []
+        if display_path is None:
+            display_path = filepath
         try:
-            with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-                for line_num, line in enumerate(f, 1):
-                    # Check each line against every compiled rule
-                    for secret_type, pattern_compiled in self.compiled_rules.items():
-                        match = pattern_compiled.search(line)
-                        if match:
-                            # Truncate the excerpt to 80 characters for the display
-                            excerpt = line.strip()
-                            if len(excerpt) > 80:
-                                excerpt = excerpt[:77] + '...'
-
-                            # Create a Finding object
-                            finding = Finding(
-                                secret_type=secret_type,
-                                # Use relative path for cleaner output in the UI
-                                file=filepath, 
-                                line=line_num,
-                                excerpt=excerpt,
-                                severity=self.rules[secret_type].get('severity', 'Unknown')
-                            )
-                            findings.append(finding)
-        except Exception as e:
-            # Skip files that cannot be read (e.g., binaries, permission issues)
+            with open(filepath, 'rb') as f:
+                size = os.fstat(f.fileno()).st_size
+                if size == 0:
+                    # Empty files cannot be mapped (and contain no secrets)
+                    return []
+                if size > LARGE_FILE_THRESHOLD:
+                    return self._scan_tiles(f, display_path)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    return self._scan_buffer(mm, display_path)
+        except (OSError, ValueError) as e:
+            # Skip files that cannot be read (e.g., permission issues)
             print(f"[WARNING] Could not read file {filepath}: {e}")
-            
-        return findings
+            return []
+        except Exception as e:
+            # Skip files the regex engine fails on, rather than the whole scan
+            print(f"[WARNING] Could not scan file {filepath}: {e}")
+            return []
 
     def scan_directory(self, root_dir):
         """
         Recursively scans all files in a directory, ignoring common paths.
 
+        Directories of PROCESS_POOL_MIN_FILES files or more are scanned by
+        worker processes, which are spawned and so import the caller's main
+        module again: a script calling this must keep its top-level code
+        under an if __name__ == '__main__': guard, and cannot be run from
+        standard input.
+
         Args:
             root_dir (str): The path to the directory to scan.
 
         Returns:
-            list: A list of all Finding named tuples found.
+            list: A list of all Finding objects found.
+        """
+        return list(self.scan_directory_iter(root_dir))
+
+    def scan_directory_iter(self, root_dir):
+        """
+        Recursively scans all files in a directory, yielding findings as each file is scanned.
+
+        Large directories are scanned by spawned worker processes, as in
+        scan_directory.
+
+        Args:
+            root_dir (str): The path to the directory to scan.
+
+        Yields:
+            Finding: Each finding, with its path relative to root_dir.
         """
-        all_findings = []
-        
-        # Define common directories/files to ignore to improve performance and relevance
-        ignored_dirs = ['.git', '__pycache__', 'node_modules', 'venv', '.vscode']
-        ignored_extensions = ['.jpg', '.jpeg', '.png', '.gif', '.bin', '.exe', '.dll', '.zip', '.tar', '.gz']
-        
         # Normalize the root directory path
         root_dir = os.path.abspath(root_dir)
 
@@ -96,32 +1017,93 @@ class SecretScanner:
         if not os.path.isdir(root_dir):
             raise FileNotFoundError(f"The directory or cloned repository path was not found: {root_dir}")
 
-        for dirpath, dirnames, filenames in os.walk(root_dir):
-            # Modify dirnames in place to skip ignored directories
-            dirnames[:] = [d for d in dirnames if d not in ignored_dirs]
-            
-            for filename in filenames:
-                file_extension = os.path.splitext(filename)[1].lower()
-                if file_extension in ignored_extensions:
-                    continue
-                    
-                filepath = os.path.join(dirpath, filename)
-                
-                # Make the path relative to the root_dir for cleaner UI display
-                relative_filepath = os.path.relpath(filepath, root_dir)
-                
-                # Perform the scan on the file
-                file_findings = self._scan_file(filepath)
-                
-                # Update findings with the relative path before adding to the main list
-                updated_findings = [
-                    finding._replace(file=relative_filepath) 
-                    for finding in file_findings
-                ]
-
-                all_findings.extend(updated_findings)
-
-        return all_findings
+        # Collect every file up front so reads can be issued ahead of the scan,
+        # along with its path relative to the root_dir for cleaner UI display
+        filepaths = []
+        display_paths = []
+        for filepath, display_path in _walk(root_dir):
+            filepaths.append(filepath)
+            display_paths.append(display_path)
+
+        for file_findings in self._scan_files(filepaths, display_paths):
+            yield from file_findings
+
+    def _scan_files(self, filepaths, display_paths):
+        """
+        Scans a list of files, yielding the findings of each file in order.
+
+        Args:
+            filepaths (list): The full paths of the files to scan.
+            display_paths (list): The path to report in the findings of each file.
+
+        Yields:
+            list: The Finding objects of each file.
+        """
+        if len(filepaths) >= PROCESS_POOL_MIN_FILES:
+            # Files are independent, so shard them across one process per core.
+            # The pool outlives the scan, and each worker compiles a given set
+            # of rules once, so later scans skip both process start-up and the
+            # regex compilers
+            rules_args = repeat((self.rules, self.use_pcre2_jit))
+            try:
+                yield from _get_process_pool().map(_scan_file_worker, rules_args, filepaths, display_paths,
+                                                   chunksize=PROCESS_POOL_CHUNKSIZE)
+            except BrokenProcessPool:
+                # A worker died; start a fresh pool for the next scan
+                _reset_process_pool()
+                raise
+        else:
+            for (filepath, buf), display_path in zip(_read_files(filepaths), display_paths):
+                if buf is _LARGE_FILE:
+                    yield self._scan_file(filepath, display_path)
+                elif buf is not None:
+                    try:
+                        file_findings = self._scan_buffer(buf, display_path)
+                    except Exception as e:
+                        # Skip files the regex engine fails on, rather than the whole scan
+                        print(f"[WARNING] Could not scan file {filepath}: {e}")
+                        file_findings = []
+                    yield file_findings
+
+# --- Process Pool Workers ---
+
+# Pool shared by every scan in this process, started by the first large scan
+_process_pool = None
+_process_pool_lock = threading.Lock()
+
+# Scanner owned by each worker process, replaced whenever the rules change
+_worker_scanner = None
+
+def _get_process_pool():
+    """
+    Returns the process pool, starting it if needed.
+
+    Workers are spawned rather than forked: the pool may be started from a
+    request thread while other threads hold locks, and a forked child would
+    inherit those locks held, with no thread left to release them.
+    """
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(mp_context=multiprocessing.get_context('spawn'))
+        return _process_pool
+
+def _reset_process_pool():
+    """Discards a broken process pool so the next scan starts a new one."""
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False)
+            _process_pool = None
+
+def _scan_file_worker(rules_args, filepath, display_path):
+    """Scans a single file using the worker process's scanner for the given rules."""
+    global _worker_scanner
+    rules, use_pcre2_jit = rules_args
+    if (_worker_scanner is None or _worker_scanner.rules != rules
+            or _worker_scanner.use_pcre2_jit != use_pcre2_jit):
+        _worker_scanner = SecretScanner(rules, use_pcre2_jit)
+    return _worker_scanner._scan_file(filepath, display_path)
 
 if __name__ == '__main__':
     # --- Mock Rules for Testing ---
@@ -0,0 +1,13 @@
+"""
+Builds the optional Cython scan loop (scanner_core) in place:
+
+    pip install cython
+    python setup.py build_ext --inplace
+"""
+from setuptools import setup
+from Cython.Build import cythonize
+
+setup(
+    name='securescan-scanner-core',
+    ext_modules=cythonize('scanner_core.pyx'),
+)